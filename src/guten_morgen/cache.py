@@ -2,10 +2,42 @@
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
 import json
+import mmap
+import os
+import random
+import shutil
+import tempfile
+import threading
 import time
-from pathlib import Path
-from typing import Any
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from typing import BinaryIO
+
+try:
+    import orjson  # type: ignore[import-not-found,unused-ignore]
+
+    def _dumps(data: Any) -> bytes:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def _loads(raw: bytes | memoryview) -> Any:
+        return orjson.loads(raw)
+
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+
+    def _dumps(data: Any) -> bytes:
+        return json.dumps(data, default=str, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def _loads(raw: bytes | memoryview) -> Any:
+        return json.loads(bytes(raw))
+
 
 # TTL constants (seconds)
 TTL_ACCOUNTS = 604800  # 7 days
@@ -17,82 +49,273 @@ TTL_SINGLE = 300  # 5 minutes (get by ID)
 TTL_TASK_ACCOUNTS = 604800  # 7 days
 TTL_TASK_LISTS = 86400  # 24 hours (lists change rarely)
 
-_DEFAULT_CACHE_DIR = Path.home() / ".cache" / "guten-morgen"
+# Payloads at least this large are parsed straight from an mmap of the file;
+# below it a plain read is cheaper than setting up the mapping.
+_MMAP_THRESHOLD = 64 * 1024
+
+# Payloads at least this large are zlib-compressed on disk. API responses repeat
+# the same field names in every item, so they shrink several-fold at level 1.
+_COMPRESS_THRESHOLD = 32 * 1024
+
+# Number of decoded payloads kept in memory per CacheStore.
+_MEMO_SIZE = 128
+
+# Default caps on the cache directory, enforced by evicting the least recently
+# written entries.
+_MAX_ENTRIES = 2000
+_MAX_BYTES = 64 * 1024 * 1024
+
+# The caps are checked on roughly one write in this many. Each store starts at a
+# random point in the cycle so short-lived CLI processes, which only write a few
+# entries each, still take their share of the sweeps.
+_EVICT_INTERVAL = 32
+
+
+def _namespace(key: str) -> str:
+    """Return the directory name for a key's first path segment."""
+    head = key.partition("/")[0]
+    return head if head.isidentifier() else hashlib.blake2b(head.encode(), digest_size=8).hexdigest()
+
+
+def _read_header(f: BinaryIO) -> tuple[int, str]:
+    """Parse an entry's ``<ttl> <key>`` header line; raises ValueError if malformed."""
+    ttl, _, key = f.readline().rstrip(b"\n").partition(b" ")
+    return int(ttl), key.decode()
+
+
+def _decode(raw: bytes | memoryview) -> Any:
+    """Parse a stored payload, inflating it first if it was compressed."""
+    if raw[:1] == b"x":  # zlib stream header; a JSON document never starts with "x"
+        return _loads(zlib.decompress(raw))
+    return _loads(raw)
 
 
 class CacheStore:
-    """File-based TTL cache for API responses."""
+    """File-based TTL cache for API responses.
 
-    def __init__(self, cache_dir: Path | None = None) -> None:
-        self._dir = cache_dir or _DEFAULT_CACHE_DIR
-        self._dir.mkdir(parents=True, exist_ok=True)
-        self._meta_path = self._dir / "_meta.json"
-        self._meta: dict[str, dict[str, float]] = self._load_meta()
+    Each entry is a single file named by a hash of its key and grouped in a
+    directory per namespace (the key's first segment), so ``invalidate("tasks")``
+    only has to empty one directory. A file holds a ``<ttl> <key>`` header line
+    followed by the JSON payload. Freshness is judged against the file's mtime,
+    so a write touches exactly one file and there is no shared metadata to keep
+    in sync.
+    """
 
-    def _load_meta(self) -> dict[str, dict[str, float]]:
-        try:
-            raw: dict[str, dict[str, float]] = json.loads(self._meta_path.read_text())
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-        return raw
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        *,
+        max_entries: int = _MAX_ENTRIES,
+        max_bytes: int = _MAX_BYTES,
+    ) -> None:
+        if cache_dir is None:
+            from guten_morgen.config import _default_cache_dir
 
-    def _save_meta(self) -> None:
-        self._meta_path.write_text(json.dumps(self._meta))
+            cache_dir = _default_cache_dir()
+        # Created on first write, so commands that never touch the cache do no I/O here.
+        self._dir = cache_dir
+        # key -> ((st_mtime_ns, st_size), ttl, decoded payload), least recently used first
+        self._memo: OrderedDict[str, tuple[tuple[int, int], int, Any]] = OrderedDict()
+        # Guards the memo; entry files need no lock since writes are atomic renames.
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._writes_until_evict = random.randint(1, _EVICT_INTERVAL)
 
     def _data_path(self, key: str) -> Path:
-        safe = key.replace("/", "--")
-        return self._dir / f"{safe}.json"
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return self._dir / _namespace(key) / f"{digest}.json"
+
+    def _entries(self) -> Iterator[os.DirEntry[str]]:
+        """Yield the entry files of every namespace directory."""
+        for ns in self._namespace_dirs():
+            with os.scandir(ns) as it:
+                yield from (e for e in it if e.name.endswith(".json"))
+
+    def _namespace_dirs(self) -> list[str]:
+        try:
+            with os.scandir(self._dir) as top:
+                return [d.path for d in top if d.is_dir(follow_symlinks=False)]
+        except FileNotFoundError:
+            return []
+
+    def _recall(self, key: str, stamp: tuple[int, int]) -> tuple[int, Any] | None:
+        """Return the memoised (ttl, payload) for key if it was decoded from this file version."""
+        with self._lock:
+            memo = self._memo.get(key)
+            if memo is None or memo[0] != stamp:
+                return None
+            self._memo.move_to_end(key)
+            return memo[1], memo[2]
+
+    def _remember(self, key: str, stamp: tuple[int, int], ttl: int, data: Any) -> None:
+        with self._lock:
+            self._memo[key] = (stamp, ttl, data)
+            self._memo.move_to_end(key)
+            if len(self._memo) > _MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._forget(key)
 
     def get(self, key: str) -> Any | None:
-        """Return cached data if fresh, else None."""
-        entry = self._meta.get(key)
-        if entry is None:
-            return None
-        if time.time() > entry["ts"] + entry["ttl"]:
-            return None
+        """Return cached data if fresh, else None.
+
+        Decoded payloads are kept in an in-process LRU and reused for as long
+        as the file's mtime and size are unchanged, so a repeat hit costs a
+        single stat. Returned objects may be shared and must not be mutated.
+        """
         path = self._data_path(key)
         try:
-            return json.loads(path.read_text())
-        except (FileNotFoundError, json.JSONDecodeError):
+            st = os.stat(path)
+            memo = self._recall(key, (st.st_mtime_ns, st.st_size))
+            if memo is not None:
+                return None if time.time() > st.st_mtime + memo[0] else memo[1]
+            with path.open("rb") as f:
+                st = os.fstat(f.fileno())
+                ttl, stored_key = _read_header(f)
+                if stored_key != key or time.time() > st.st_mtime + ttl:
+                    return None
+                if st.st_size < _MMAP_THRESHOLD:
+                    data = _decode(f.read())
+                else:
+                    offset = f.tell()
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm)[offset:] as view:
+                        data = _decode(view)
+        except (FileNotFoundError, ValueError, zlib.error):
+            self._forget(key)
             return None
+        self._remember(key, (st.st_mtime_ns, st.st_size), ttl, data)
+        return data
 
     def set(self, key: str, data: Any, ttl: int) -> None:
-        """Cache data with a TTL in seconds."""
+        """Cache data with a TTL in seconds.
+
+        The entry is written to a temporary file and renamed into place, so
+        readers never observe a partially written payload.
+        """
+        self._forget(key)
+        payload = _dumps(data)
+        if len(payload) >= _COMPRESS_THRESHOLD:
+            payload = zlib.compress(payload, 1)
         path = self._data_path(key)
-        path.write_text(json.dumps(data, default=str, ensure_ascii=False))
-        self._meta[key] = {"ts": time.time(), "ttl": float(ttl)}
-        self._save_meta()
+        try:
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(b"%d %s\n" % (ttl, key.encode()))
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._writes_until_evict -= 1
+        if self._writes_until_evict <= 0:
+            self._writes_until_evict = _EVICT_INTERVAL
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the least recently written entries once either cap is exceeded.
+
+        Eviction continues until both the entry count and total size are back
+        under 90% of their caps, so the next sweep is not immediately due.
+        """
+        files: list[tuple[float, int, str]] = []
+        for entry in self._entries():
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, entry.path))
+        count = len(files)
+        total = sum(size for _, size, _ in files)
+        if count <= self._max_entries and total <= self._max_bytes:
+            return
+        target_entries = self._max_entries * 9 // 10
+        target_bytes = self._max_bytes * 9 // 10
+        for _, size, path in sorted(files):
+            if count <= target_entries and total <= target_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            count -= 1
+            total -= size
+
+    def touch(self, key: str) -> bool:
+        """Restart an entry's TTL without rewriting it. Return False if there is no entry."""
+        self._forget(key)
+        try:
+            os.utime(self._data_path(key))
+        except FileNotFoundError:
+            return False
+        return True
 
     def invalidate(self, prefix: str) -> None:
         """Remove all cache entries whose key starts with prefix."""
-        to_remove = [k for k in self._meta if k == prefix or k.startswith(prefix + "/")]
-        for key in to_remove:
-            self._data_path(key).unlink(missing_ok=True)
-            del self._meta[key]
-        if to_remove:
-            self._save_meta()
+        prefix_slash = prefix + "/"
+        with self._lock:
+            self._memo = OrderedDict(
+                (k, v) for k, v in self._memo.items() if k != prefix and not k.startswith(prefix_slash)
+            )
+        try:
+            it = os.scandir(self._dir / _namespace(prefix))
+        except FileNotFoundError:
+            return
+        with it:
+            if "/" not in prefix:
+                # The whole namespace goes: no need to look inside the files.
+                doomed = [e.path for e in it if e.name.endswith(".json")]
+            else:
+                doomed = []
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        with open(entry.path, "rb") as f:
+                            key = _read_header(f)[1]
+                    except (FileNotFoundError, ValueError):
+                        continue
+                    if key == prefix or key.startswith(prefix_slash):
+                        doomed.append(entry.path)
+        for path in doomed:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
 
     def clear(self) -> None:
         """Wipe all cached data."""
-        for key in list(self._meta):
-            self._data_path(key).unlink(missing_ok=True)
-        self._meta.clear()
-        self._save_meta()
+        with self._lock:
+            self._memo.clear()
+        for ns in self._namespace_dirs():
+            # Also sweeps temporaries orphaned by a writer that died before its rename.
+            shutil.rmtree(ns, ignore_errors=True)
+        # Flat files left behind by older cache layouts; ``_``-prefixed files
+        # such as the bearer token are not cache entries.
+        for path in self._dir.glob("*.json"):
+            if not path.name.startswith("_") or path.name == "_meta.json":
+                path.unlink(missing_ok=True)
 
     def stats(self) -> dict[str, Any]:
         """Return cache statistics."""
         now = time.time()
         keys: dict[str, dict[str, Any]] = {}
-        for key, entry in self._meta.items():
-            age = now - entry["ts"]
-            remaining = entry["ttl"] - age
-            path = self._data_path(key)
-            size = path.stat().st_size if path.exists() else 0
+        for entry in self._entries():
+            try:
+                st = entry.stat()
+                with open(entry.path, "rb") as f:
+                    ttl, key = _read_header(f)
+            except (FileNotFoundError, ValueError):
+                continue
+            age = now - st.st_mtime
+            remaining = ttl - age
             keys[key] = {
                 "age_seconds": round(age, 1),
-                "ttl": int(entry["ttl"]),
+                "ttl": ttl,
                 "remaining_seconds": round(max(0, remaining), 1),
                 "expired": remaining <= 0,
-                "size_bytes": size,
+                "size_bytes": st.st_size,
             }
         return {"entries": len(keys), "cache_dir": str(self._dir), "keys": keys}
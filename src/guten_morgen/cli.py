@@ -28,45 +28,53 @@ from guten_morgen.output import render
 # ---------------------------------------------------------------------------
 
 
-def output_options(f: Callable[..., Any]) -> Callable[..., Any]:
-    """Shared decorator that adds --format, --json, --fields, --jq, --response-format to a command."""
-
-    @click.option(
-        "--format", "fmt", type=click.Choice(["table", "json", "jsonl", "csv"]), default="table", help="Output format."
-    )
-    @click.option("--json", "json_flag", is_flag=True, help="Shortcut for --format json.")
-    @click.option("--fields", "fields_str", default=None, help="Comma-separated field list.")
-    @click.option("--jq", "jq_expr", default=None, help="jq expression for filtering.")
-    @click.option(
-        "--response-format",
-        "response_format",
+_FIELDS_SEP_RE = re.compile(r"\s*,\s*")
+
+# Built once and shared by every command; click options hold no per-command state.
+_OUTPUT_OPTIONS: list[click.Option] = [
+    click.Option(
+        ["--format", "fmt"],
+        type=click.Choice(["table", "json", "jsonl", "csv"]),
+        default="table",
+        help="Output format.",
+    ),
+    click.Option(["--json", "json_flag"], is_flag=True, help="Shortcut for --format json."),
+    click.Option(["--fields", "fields_str"], default=None, help="Comma-separated field list."),
+    click.Option(["--jq", "jq_expr"], default=None, help="jq expression for filtering."),
+    click.Option(
+        ["--response-format", "response_format"],
         type=click.Choice(["detailed", "concise"]),
         default="detailed",
         help="Response verbosity: concise for ~1/3 tokens.",
-    )
-    @click.option("--short-ids", is_flag=True, default=False, help="Truncate IDs to 12 chars.")
-    @click.option("--no-frames", is_flag=True, default=False, help="Exclude Morgen scheduling frames.")
-    @click.option(
-        "--hide-declined",
+    ),
+    click.Option(["--short-ids"], is_flag=True, default=False, help="Truncate IDs to 12 chars."),
+    click.Option(["--no-frames"], is_flag=True, default=False, help="Exclude Morgen scheduling frames."),
+    click.Option(
+        ["--hide-declined"],
         is_flag=True,
         default=False,
         help="Exclude events you declined (alias for --status with declined removed).",
-    )
-    @click.option(
-        "--event-status",
-        "event_status_filter",
+    ),
+    click.Option(
+        ["--event-status", "event_status_filter"],
         default=None,
         help="Comma-separated list of my_status values to include (accepted,tentative,needs-action,declined,null).",
-    )
-    @click.option("--counts", is_flag=True, default=False, help="Wrap JSON output with meta including status_counts.")
-    @click.option(
-        "--raw-times",
+    ),
+    click.Option(["--counts"], is_flag=True, default=False, help="Wrap JSON output with meta including status_counts."),
+    click.Option(
+        ["--raw-times"],
         is_flag=True,
         default=False,
         help="Show event times as the raw per-event wall-clock instead of converting to your "
         "local zone. By default the CLI re-expresses event start/end in your local zone "
         "(offset-qualified, e.g. 2026-06-03T16:00:00+02:00).",
-    )
+    ),
+]
+
+
+def output_options(f: Callable[..., Any]) -> Callable[..., Any]:
+    """Shared decorator that adds --format, --json, --fields, --jq, --response-format to a command."""
+
     @functools.wraps(f)
     def wrapper(
         *args: Any,
@@ -92,13 +100,19 @@ def output_options(f: Callable[..., Any]) -> Callable[..., Any]:
         _ = raw_times
         if json_flag:
             fmt = "json"
-        fields = [s.strip() for s in fields_str.split(",")] if fields_str else None
+        fields = _FIELDS_SEP_RE.split(fields_str.strip()) if fields_str else None
         kwargs["fmt"] = fmt
         kwargs["fields"] = fields
         kwargs["jq_expr"] = jq_expr
         kwargs["response_format"] = response_format
         return f(*args, **kwargs)
 
+    # Same bookkeeping as stacked @click.option decorators: click reverses
+    # __click_params__ when building the command, so store them last-first.
+    wrapper.__click_params__ = [  # type: ignore[attr-defined]
+        *getattr(wrapper, "__click_params__", []),
+        *reversed(_OUTPUT_OPTIONS),
+    ]
     return wrapper
 
 
@@ -80,8 +80,10 @@ class Settings:
 
 
 def _default_cache_dir() -> Path:
-    """Return default cache directory for guten-morgen."""
-    return Path.home() / ".cache" / "guten-morgen"
+    """Return default cache directory: $XDG_CACHE_HOME/guten-morgen (default ~/.cache/)."""
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+    return base / _APP_DIR
 
 
 def load_settings() -> Settings:
@@ -90,8 +92,9 @@ def load_settings() -> Settings:
     API key priority: $MORGEN_API_KEY env var > api_key in config TOML.
     """
     raw = load_config_toml()
+    env = os.environ
 
-    api_key = os.environ.get("MORGEN_API_KEY") or str(raw.get("api_key", ""))
+    api_key = env.get("MORGEN_API_KEY") or str(raw.get("api_key", ""))
     if not api_key:
         raise ConfigError(
             "MORGEN_API_KEY is not set",
@@ -102,7 +105,7 @@ def load_settings() -> Settings:
         )
 
     # Bearer token: env var override > desktop app discovery
-    bearer_token = os.environ.get("MORGEN_BEARER_TOKEN")
+    bearer_token = env.get("MORGEN_BEARER_TOKEN")
     if not bearer_token:
         from guten_morgen.auth import get_bearer_token
 
@@ -110,7 +113,7 @@ def load_settings() -> Settings:
 
     return Settings(
         api_key=api_key,
-        base_url=os.environ.get("MORGEN_BASE_URL", "https://api.morgen.so/v3"),
-        timeout=float(os.environ.get("MORGEN_TIMEOUT", "30.0")),
+        base_url=env.get("MORGEN_BASE_URL", "https://api.morgen.so/v3"),
+        timeout=float(env.get("MORGEN_TIMEOUT", "30.0")),
         bearer_token=bearer_token or None,
     )
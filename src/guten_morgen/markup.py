@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import re
 
+_BARE_LI_RE = re.compile(r"<li>(?!<p>)(.*?)</li>", re.DOTALL)
+
 
 def _is_html(text: str) -> bool:
     """Check if text contains HTML tags."""
@@ -34,12 +36,9 @@ def _wrap_bare_li(html: str) -> str:
     TipTap expects ``<li><p>text</p></li>``; bare ``<li>text</li>``
     renders with empty bullet artifacts.
     """
-    return re.sub(
-        r"<li>(?!<p>)(.*?)</li>",
-        r"<li><p>\1</p></li>",
-        html,
-        flags=re.DOTALL,
-    )
+    if "<li>" not in html:
+        return html
+    return _BARE_LI_RE.sub(r"<li><p>\1</p></li>", html)
 
 
 def _minify_html(html: str) -> str:
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import os
 import time
 from pathlib import Path
 
+import pytest
+
 from guten_morgen.cache import CacheStore
 
 
@@ -31,6 +34,33 @@ class TestCacheGetSet:
         result = store.get("events/abc123")
         assert result == [{"id": "evt-1"}]
 
+    def test_set_leaves_no_temporary_files(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        store.set("events/abc123", [{"id": "evt-1"}], ttl=3600)
+        assert [p.name for p in tmp_path.iterdir()] == ["events"]
+        assert [p.suffix for p in (tmp_path / "events").iterdir()] == [".json"]
+
+    def test_unserialisable_payload_keeps_previous_entry(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        store.set("accounts", [{"id": "a1"}], ttl=3600)
+        with pytest.raises(TypeError):
+            store.set("accounts", {("tuple", "key"): 1}, ttl=3600)
+        assert store.get("accounts") == [{"id": "a1"}]
+        assert list(tmp_path.glob(".*.tmp")) == []
+
+    def test_large_payload_roundtrip(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        events = [{"id": f"evt-{i}", "title": "x" * 100} for i in range(1000)]
+        store.set("events/big", events, ttl=3600)
+        assert store.get("events/big") == events
+        assert store._data_path("events/big").stat().st_size < 20 * 1024
+
+    def test_uncompressible_large_payload_roundtrip(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        payload = {"blob": os.urandom(100 * 1024).hex()}
+        store.set("events/random", payload, ttl=3600)
+        assert store.get("events/random") == payload
+
     def test_overwrite_existing_key(self, tmp_path: Path) -> None:
         store = CacheStore(cache_dir=tmp_path)
         store.set("accounts", [{"id": "old"}], ttl=3600)
@@ -38,6 +68,105 @@ class TestCacheGetSet:
         assert store.get("accounts") == [{"id": "new"}]
 
 
+class TestCacheLazyDir:
+    def test_construction_does_not_create_dir(self, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        store = CacheStore(cache_dir=cache_dir)
+        assert not cache_dir.exists()
+        assert store.get("accounts") is None
+        assert store.stats()["entries"] == 0
+        store.invalidate("tasks")
+        store.clear()
+        assert not cache_dir.exists()
+
+    def test_first_write_creates_dir(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path / "nested" / "cache")
+        store.set("accounts", [{"id": "a1"}], ttl=3600)
+        assert store.get("accounts") == [{"id": "a1"}]
+
+
+class TestCacheMemo:
+    def test_repeat_get_reuses_decoded_payload(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        store.set("accounts", [{"id": "a1"}], ttl=3600)
+        first = store.get("accounts")
+        assert store.get("accounts") is first
+
+    def test_sees_writes_from_another_store(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        store.set("accounts", [{"id": "old"}], ttl=3600)
+        assert store.get("accounts") == [{"id": "old"}]
+        CacheStore(cache_dir=tmp_path).set("accounts", [{"id": "newer"}], ttl=3600)
+        assert store.get("accounts") == [{"id": "newer"}]
+
+    def test_sees_invalidation_from_another_store(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        store.set("tasks/list", [{"id": "t1"}], ttl=3600)
+        assert store.get("tasks/list") is not None
+        CacheStore(cache_dir=tmp_path).invalidate("tasks")
+        assert store.get("tasks/list") is None
+
+    def test_memo_is_bounded(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        for i in range(200):
+            store.set(f"tasks/{i}", {"id": i}, ttl=3600)
+            store.get(f"tasks/{i}")
+        assert len(store._memo) == 128
+        assert "tasks/199" in store._memo
+        assert "tasks/0" not in store._memo
+
+
+class TestCacheTouch:
+    def test_touch_restarts_ttl(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        store.set("accounts", [{"id": "a1"}], ttl=60)
+        path = store._data_path("accounts")
+        os.utime(path, (time.time() - 120, time.time() - 120))
+        assert store.get("accounts") is None
+        assert store.touch("accounts") is True
+        assert store.get("accounts") == [{"id": "a1"}]
+
+    def test_touch_missing_key(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        assert store.touch("accounts") is False
+
+
+class TestCacheEviction:
+    def test_entry_cap_evicts_oldest(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path, max_entries=10)
+        for i in range(20):
+            store.set(f"tasks/{i}", {"id": i}, ttl=3600)
+            os.utime(store._data_path(f"tasks/{i}"), (1000 + i, 1000 + i))
+        store._evict()
+        keys = store.stats()["keys"]
+        assert len(keys) == 9
+        assert "tasks/19" in keys
+        assert "tasks/10" not in keys
+
+    def test_byte_cap_evicts_oldest(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path, max_bytes=4096)
+        for i in range(10):
+            store.set(f"events/{i}", "x" * 1000, ttl=3600)
+            os.utime(store._data_path(f"events/{i}"), (1000 + i, 1000 + i))
+        store._evict()
+        stats = store.stats()
+        assert sum(k["size_bytes"] for k in stats["keys"].values()) <= 4096 * 9 // 10
+        assert "events/9" in stats["keys"]
+
+    def test_under_caps_evicts_nothing(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path, max_entries=10)
+        for i in range(10):
+            store.set(f"tasks/{i}", {"id": i}, ttl=3600)
+        store._evict()
+        assert store.stats()["entries"] == 10
+
+    def test_set_sweeps_periodically(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path, max_entries=5)
+        for i in range(40):
+            store.set(f"tasks/{i}", {"id": i}, ttl=3600)
+        assert store.stats()["entries"] < 40
+
+
 class TestCacheInvalidate:
     def test_invalidate_removes_matching_keys(self, tmp_path: Path) -> None:
         store = CacheStore(cache_dir=tmp_path)
@@ -49,6 +178,23 @@ class TestCacheInvalidate:
         assert store.get("tasks/abc") is None
         assert store.get("accounts") == [{"id": "a1"}]
 
+    def test_invalidate_nested_prefix(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        store.set("tasks/acc-1", {"id": "t1"}, ttl=3600)
+        store.set("tasks/acc-1/extra", {"id": "t2"}, ttl=3600)
+        store.set("tasks/acc-10", {"id": "t3"}, ttl=3600)
+        store.invalidate("tasks/acc-1")
+        assert store.get("tasks/acc-1") is None
+        assert store.get("tasks/acc-1/extra") is None
+        assert store.get("tasks/acc-10") == {"id": "t3"}
+
+    def test_very_long_key(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        key = "events/" + "x" * 1000
+        store.set(key, [{"id": "evt-1"}], ttl=3600)
+        assert store.get(key) == [{"id": "evt-1"}]
+        assert key in store.stats()["keys"]
+
     def test_invalidate_nonexistent_prefix_is_noop(self, tmp_path: Path) -> None:
         store = CacheStore(cache_dir=tmp_path)
         store.set("accounts", [{"id": "a1"}], ttl=3600)
@@ -65,6 +211,20 @@ class TestCacheClear:
         assert store.get("accounts") is None
         assert store.get("tasks/list") is None
 
+    def test_clear_removes_legacy_flat_files(self, tmp_path: Path) -> None:
+        (tmp_path / "_meta.json").write_text("{}")
+        (tmp_path / "accounts.json").write_text("[]")
+        store = CacheStore(cache_dir=tmp_path)
+        store.clear()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_clear_keeps_bearer_token(self, tmp_path: Path) -> None:
+        (tmp_path / "_bearer.json").write_text('{"token": "t", "expires_at": 0}')
+        store = CacheStore(cache_dir=tmp_path)
+        store.set("accounts", [{"id": "a1"}], ttl=3600)
+        store.clear()
+        assert (tmp_path / "_bearer.json").exists()
+
 
 class TestCacheStats:
     def test_stats_shows_entries(self, tmp_path: Path) -> None:
@@ -75,6 +235,8 @@ class TestCacheStats:
         assert stats["entries"] == 2
         assert "accounts" in stats["keys"]
         assert "tasks/list" in stats["keys"]
+        assert stats["keys"]["tasks/list"]["ttl"] == 1800
+        assert stats["keys"]["tasks/list"]["expired"] is False
 
     def test_stats_empty_cache(self, tmp_path: Path) -> None:
         store = CacheStore(cache_dir=tmp_path)
@@ -90,10 +252,24 @@ class TestCacheResilience:
         store._data_path("accounts").write_text("not json{{{")
         assert store.get("accounts") is None
 
-    def test_corrupt_meta_file_starts_fresh(self, tmp_path: Path) -> None:
-        (tmp_path / "_meta.json").write_text("not json{{{")
+    def test_hash_collision_is_a_miss(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        store.set("tasks/a", {"id": "a"}, ttl=3600)
+        store._data_path("tasks/a").rename(store._data_path("tasks/b"))
+        assert store.get("tasks/b") is None
+
+    def test_legacy_meta_file_is_ignored(self, tmp_path: Path) -> None:
+        (tmp_path / "_meta.json").write_text('{"accounts": {"ts": 0, "ttl": 3600}}')
         store = CacheStore(cache_dir=tmp_path)
-        assert store.get("anything") is None
+        assert store.get("accounts") is None
+        assert store.stats()["entries"] == 0
+
+    def test_legacy_headerless_file_returns_none(self, tmp_path: Path) -> None:
+        store = CacheStore(cache_dir=tmp_path)
+        path = store._data_path("accounts")
+        path.parent.mkdir()
+        path.write_text('[{"id": "a1"}]')
+        assert store.get("accounts") is None
 
     def test_missing_data_file_returns_none(self, tmp_path: Path) -> None:
         store = CacheStore(cache_dir=tmp_path)
@@ -40,6 +40,12 @@ class TestAccounts:
         assert "name" in data[0]
         assert "id" not in data[0]
 
+    def test_fields_filter_tolerates_spaces(self, runner: CliRunner, mock_client: MorgenClient) -> None:
+        result = runner.invoke(cli, ["accounts", "--json", "--fields", " name , integrationId "])
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert set(data[0]) == {"name", "integrationId"}
+
 
 class TestCalendars:
     def test_json_output(self, runner: CliRunner, mock_client: MorgenClient) -> None:
@@ -87,10 +87,10 @@ class TestCacheInvalidationOnWrite:
     def test_create_event_invalidates_events_cache(self, tmp_path: Path) -> None:
         client, cache = _make_client(tmp_path)
         client.list_events("acc-1", ["cal-1"], "2026-01-01", "2026-01-02")
-        events_keys = [k for k in cache._meta if k.startswith("events")]
+        events_keys = [k for k in cache.stats()["keys"] if k.startswith("events")]
         assert len(events_keys) > 0
         client.create_event({"title": "New", "accountId": "acc-1", "calendarId": "cal-1"})
-        events_keys = [k for k in cache._meta if k.startswith("events")]
+        events_keys = [k for k in cache.stats()["keys"] if k.startswith("events")]
         assert len(events_keys) == 0
 
     def test_create_task_invalidates_morgen_cache(self, tmp_path: Path) -> None:
@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 
-from guten_morgen.config import Settings, find_config, load_settings
+from guten_morgen.config import Settings, _default_cache_dir, find_config, load_settings
 from guten_morgen.errors import ConfigError
 
 
@@ -199,3 +199,14 @@ class TestBearerTokenInSettings:
         with patch("guten_morgen.auth.get_bearer_token", return_value="desktop-token"):
             settings = load_settings()
         assert settings.bearer_token == "env-bearer"
+
+
+class TestDefaultCacheDir:
+    def test_xdg_cache_home(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+        assert _default_cache_dir() == tmp_path / "xdg-cache" / "guten-morgen"
+
+    def test_default_home_cache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert _default_cache_dir() == tmp_path / ".cache" / "guten-morgen"